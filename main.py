@@ -2,9 +2,30 @@
 import argparse
 import os
 import sys
-from src.audio import extract_audio, cleanup_audio
-from src.transcriber import transcribe_audio
-from src.formatter import save_transcript
+import threading
+import traceback
+from concurrent.futures import Future
+from src.audio import extract_audio, save_audio, SAMPLE_RATE
+from src.transcriber import transcribe_with_model, get_model, pick_compute_type, BACKENDS, DEFAULT_BACKEND
+from src.formatter import save_transcript, format_transcript_text
+
+def load_model_in_background(*args) -> Future:
+    """
+    Starts get_model(*args) on a daemon thread and returns a future for the model.
+    
+    A daemon thread lets the CLI exit straight away on an error, instead of
+    waiting at shutdown for a (possibly multi-GB, first-time) model download.
+    """
+    future = Future()
+
+    def load():
+        try:
+            future.set_result(get_model(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=load, daemon=True).start()
+    return future
 
 def main():
     parser = argparse.ArgumentParser(description="Extract audio from video and transcribe it using Whisper.")
@@ -12,8 +33,13 @@ def main():
     parser.add_argument("--output", "-o", help="Path to save the output transcript (default: <video_name>.md).")
     parser.add_argument("--device", choices=["cuda", "cpu"], default="cuda", help="Device to use for transcription (default: cuda).")
     parser.add_argument("--model", "-m", default="medium", help="Whisper model size (default: medium).")
+    parser.add_argument("--compute-type", choices=["int8", "int8_float16", "float16", "float32"], help="Quantization type (default: int8 on CPU, int8_float16 on Tensor-Core GPUs, else float16).")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND, help="Transcription backend (default: tensorrt-llm if TRT_ENGINE_DIR is set, else faster-whisper). Other backends must be installed separately.")
+    parser.add_argument("--batch-size", type=int, default=16, help="Number of audio chunks transcribed in parallel (default: 16).")
+    parser.add_argument("--beam-size", type=int, default=1, help="Beam width for decoding (default: 1). Beam 1 is ~40%% faster than beam 5; beam 2 recovers most of the accuracy on clean speech.")
+    parser.add_argument("--no-vad", action="store_true", help="Transcribe silent regions too instead of skipping them with voice activity detection (slower).")
     parser.add_argument("--format", "-f", choices=["markdown", "json"], default="markdown", help="Output format (default: markdown).")
-    parser.add_argument("--keep-audio", action="store_true", help="Keep the extracted audio file after transcription.")
+    parser.add_argument("--keep-audio", action="store_true", help="Save the extracted audio as <video_name>.wav.")
     parser.add_argument("--ai", action="store_true", help="Generate detailed AI notes using Ollama.")
     parser.add_argument("--ai-model", default="llama3", help="Ollama model to use (default: llama3).")
     
@@ -26,33 +52,44 @@ def main():
         
     base_name = os.path.splitext(os.path.basename(video_path))[0]
     output_path = args.output if args.output else f"{base_name}.md"
-    temp_audio_path = f"{base_name}_temp.wav"
     
     print(f"Processing '{video_path}'...")
     
     try:
+        # Load the Whisper model in the background while ffmpeg extracts the audio
+        compute_type = args.compute_type or pick_compute_type(args.device)
+        model_future = load_model_in_background(args.model, args.device, compute_type, args.backend, not args.no_vad)
+        
         # Step 1: Extract Audio
         print("Extracting audio...")
-        audio_file = extract_audio(video_path, temp_audio_path)
-        print(f"Audio extracted to '{audio_file}'")
+        audio = extract_audio(video_path)
+        print(f"Audio extracted ({len(audio) / SAMPLE_RATE:.0f}s)")
+        
+        if args.keep_audio:
+            audio_path = f"{base_name}.wav"
+            save_audio(audio, audio_path)
+            print(f"Audio saved to '{audio_path}'")
         
         # Step 2: Transcribe
-        # Using float16 compute type for CUDA devices
-        compute_type = "float16" if args.device == "cuda" else "int8"
+        model = model_future.result()
         
         print("Starting transcription...")
-        segments = transcribe_audio(
-            audio_file, 
-            model_size=args.model, 
-            device=args.device,
-            compute_type=compute_type
+        segments = transcribe_with_model(
+            model,
+            audio,
+            batch_size=args.batch_size,
+            beam_size=args.beam_size,
+            vad_filter=not args.no_vad,
+            backend=args.backend
         )
         
         # Step 3: Save Output
         print(f"Saving transcript to '{output_path}'...")
-        # Collect segments for AI processing
-        all_segments = list(segments)
-        save_transcript(all_segments, output_path, format=args.format)
+        if args.ai:
+            # Collect segments for AI processing
+            segments = all_segments = list(segments)
+        # Otherwise the generator streams straight to disk
+        save_transcript(segments, output_path, format=args.format)
         
         print(f"Done! Transcript saved to '{output_path}'.")
 
@@ -65,29 +102,21 @@ def main():
                 print("Error: Ollama server is not reachable. Is 'ollama serve' running?")
                 print("Skipping AI note generation.")
             else:
-                full_text = "\n".join([f"[{s['start']}-{s['end']}] {s['text']}" for s in all_segments])
+                full_text = format_transcript_text(all_segments)
                 
                 ai_output_path = args.output.replace(".md", "_notes.md") if args.output else f"{base_name}_notes.md"
                 print(f"Generating AI notes using model '{args.ai_model}'...")
                 print("This may take a while depending on the video length...")
                 
-                notes = generate_tutorial_notes(full_text, model=args.ai_model)
-                
                 with open(ai_output_path, "w", encoding="utf-8") as f:
-                    f.write(notes)
+                    generate_tutorial_notes(full_text, f, model=args.ai_model)
                 
                 print(f"AI Notes saved to '{ai_output_path}'")
 
     except Exception as e:
         print(f"An error occurred: {e}")
-        import traceback
         traceback.print_exc()
         sys.exit(1)
-    finally:
-        # Cleanup
-        if not args.keep_audio and os.path.exists(temp_audio_path):
-            print("Cleaning up temporary audio file...")
-            cleanup_audio(temp_audio_path)
 
 if __name__ == "__main__":
     # Add local 'bin' folder to PATH for portability
@@ -1,8 +1,56 @@
 
 import ollama
+import queue
+import threading
+import tiktoken
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-def generate_tutorial_notes(transcript_text, model="llama3"):
+# Number of chunks sent to Ollama at once
+MAX_PARALLEL_CHUNKS = 4
+# Context window requested from Ollama (Llama 3 8B supports 8k)
+CONTEXT_LENGTH = 8192
+# Keep the model loaded between chunk requests
+KEEP_ALIVE = "30m"
+# Starts the text written in place of a chunk whose request failed
+FAILED_SECTION_MARKER = "[Failed to generate notes for this section"
+
+# Sent as an identical system message with every chunk so Ollama can reuse the
+# cached prefix instead of re-processing the rules each time.
+SYSTEM_PROMPT = """You are a technical documenter. Your task is to convert the video transcript segment you are given into a detailed Step-by-Step Tutorial Guide.
+
+**Rules:**
+1. RETAIN ALL DETAILS: Do not summarize into vague points. Capture every click, command, setting, and code snippet.
+2. STRUCTURE: Use clear headings (##), bullet points, and code blocks.
+3. CONTEXT: If a step is a continuation from the previous part, continue logically.
+4. NO FLUFF: Remove conversational filler (e.g., "Um", "So guys", "Welcome back"). Keep it strictly instructional.
+"""
+
+@lru_cache(maxsize=None)
+def get_encoding():
+    """Returns the tokenizer used to size transcript chunks."""
+    # cl100k_base is close enough to Llama-family tokenizers for budgeting context
+    return tiktoken.get_encoding("cl100k_base")
+
+def generate_tutorial_notes(transcript_text, out, model="llama3"):
+    """
+    Generates detailed tutorial notes from a transcript using Ollama.
+    
+    Notes are written to `out` as the model produces them, so partial
+    results are readable while later parts are still being generated.
+    
+    Args:
+        transcript_text (str): The full text of the transcript.
+        out: Writable text file object receiving the Markdown notes.
+        model (str): The Ollama model to use.
+    """
+    for piece in stream_tutorial_notes(transcript_text, model=model):
+        out.write(piece)
+        # Tokens arrive at LLM speed, so flushing each one costs nothing noticeable
+        out.flush()
+
+def stream_tutorial_notes(transcript_text, model="llama3"):
     """
     Generates detailed tutorial notes from a transcript using Ollama.
     
@@ -10,60 +58,89 @@ def generate_tutorial_notes(transcript_text, model="llama3"):
         transcript_text (str): The full text of the transcript.
         model (str): The Ollama model to use.
         
-    Returns:
-        str: The generated tutorial notes in Markdown format.
+    Yields:
+        str: Pieces of the tutorial notes in Markdown format, in order.
     """
-    # Chunking strategy: 
-    # For a 4-hour video, the transcript will be huge. 
-    # We need to split it based on token count or character count.
-    # Llama 3 8B has 8k context. approx 24k characters safely.
-    # Let's be conservative with 15k characters per chunk to allow room for the prompt and output.
+    chunks = split_transcript(transcript_text)
+    print(f"Split transcript into {len(chunks)} chunks for processing.")
     
-    chunk_size = 15000
-    overlap = 500
+    yield "# Detailed Video Tutorial\n\n"
+    
+    # Ollama serves several requests at once, so dispatch chunks concurrently.
+    # Each chunk streams into its own queue; draining the queues in order keeps
+    # the parts in sequence while later chunks keep generating in the background.
+    queues = [queue.Queue() for _ in chunks]
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHUNKS)
+    futures = [
+        executor.submit(stream_chunk, i, chunk, len(chunks), model, queues[i], stop)
+        for i, chunk in enumerate(chunks)
+    ]
+    try:
+        for i, pieces in enumerate(queues):
+            yield f"\n\n## Part {i+1}\n\n"
+            # Each worker ends its queue with None
+            yield from iter(pieces.get, None)
+    finally:
+        # If the consumer stopped early (client disconnected, error mid-yield), don't keep
+        # generating notes nobody reads: drop queued chunks and end the running streams
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def split_transcript(transcript_text):
+    """Splits the transcript into overlapping chunks that fit the LLM context."""
+    # Chunking strategy:
+    # For a 4-hour video, the transcript will be huge, so we split it into chunks.
+    # Characters-per-token varies 2-6x between languages, so we slice on real token
+    # boundaries instead. Llama 3 8B has 8k context: 6k tokens of transcript leaves
+    # room for the prompt and the generated notes.
+    
+    chunk_tokens = 6000
+    overlap = 200
+    
+    encoding = get_encoding()
+    tokens = encoding.encode(transcript_text)
     
     chunks = []
     start = 0
-    while start < len(transcript_text):
-        end = start + chunk_size
-        chunk = transcript_text[start:end]
+    while start < len(tokens):
+        end = start + chunk_tokens
+        chunk = encoding.decode(tokens[start:end])
         chunks.append(chunk)
-        start += chunk_size - overlap # Move forward with overlap
-
-    print(f"Split transcript into {len(chunks)} chunks for processing.")
+        start += chunk_tokens - overlap # Move forward with overlap
     
-    final_notes = "# Detailed Video Tutorial\n\n"
+    return chunks
+
+def stream_chunk(i, chunk, total, model, pieces, stop=None):
+    """
+    Streams the notes for one transcript chunk into the `pieces` queue.
     
-    for i, chunk in enumerate(chunks):
-        print(f"Processing chunk {i+1}/{len(chunks)}...")
+    Stops early once the optional `stop` event is set.
+    """
+    print(f"Processing chunk {i+1}/{total}...")
+    try:
+        stream = ollama.chat(
+            model=model,
+            messages=[
+                {'role': 'system', 'content': SYSTEM_PROMPT},
+                {'role': 'user', 'content': chunk},
+            ],
+            options={'num_ctx': CONTEXT_LENGTH},
+            keep_alive=KEEP_ALIVE,
+            stream=True
+        )
+        for part in stream:
+            if stop is not None and stop.is_set():
+                break
+            pieces.put(part['message']['content'])
         
-        prompt = f"""
-You are a technical documenter. Your task is to convert the following video transcript segment into a detailed Step-by-Step Tutorial Guide.
-
-**Rules:**
-1. RETAIN ALL DETAILS: Do not summarize into vague points. Capture every click, command, setting, and code snippet.
-2. STRUCTURE: Use clear headings (##), bullet points, and code blocks.
-3. CONTEXT: If a step is a continuation from the previous part, continue logically.
-4. NO FLUFF: Remove conversational filler (e.g., "Um", "So guys", "Welcome back"). Keep it strictly instructional.
-
-**Transcript Segment:**
-{chunk}
-
-**Detailed Tutorial:**
-"""
-        try:
-            response = ollama.chat(model=model, messages=[
-                {'role': 'user', 'content': prompt},
-            ])
-            
-            content = response['message']['content']
-            final_notes += f"\n\n## Part {i+1}\n\n{content}"
-            
-        except Exception as e:
-            print(f"Error processing chunk {i+1}: {e}")
-            final_notes += f"\n\n## Part {i+1} (Error)\n\n[Failed to generate notes for this section: {e}]\n"
-
-    return final_notes
+    except Exception as e:
+        print(f"Error processing chunk {i+1}: {e}")
+        pieces.put(f"\n\n{FAILED_SECTION_MARKER}: {e}]\n")
+    finally:
+        pieces.put(None)
 
 def check_ollama_server():
     """Checks if Ollama server is running."""
@@ -0,0 +1,487 @@
+import gradio as gr
+import atexit
+import os
+import shutil
+import hashlib
+import tempfile
+import threading
+import queue
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+# These are light: faster-whisper and CTranslate2 are only imported by the worker process
+from src.transcriber import pick_compute_type, BACKENDS, DEFAULT_BACKEND
+from src.formatter import format_markdown, format_transcript_text
+from src.worker import transcribe_videos, preload_model
+
+# Transcription runs in a single worker process: concurrent requests queue up behind
+# it instead of contending for the GIL and GPU, and a crash or CUDA OOM there can't
+# take down the UI. The worker keeps its loaded models cached between requests.
+# The pool is created on first use and the UI in build_ui(), so importing this
+# module has no side effects.
+def start_worker():
+    """Starts the transcription worker pool (the process itself spawns on first use)."""
+    return ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"))
+
+def get_worker():
+    """Returns the transcription worker pool, creating it on first use."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = start_worker()
+    return _EXECUTOR
+
+_EXECUTOR = None
+# Relays progress events from the worker; started on first use
+_MANAGER = None
+# Startup warm-up of the default model in the worker (see launch)
+_WARMUP = None
+
+# Minimum seconds between partial AI-notes updates pushed to the browser
+NOTES_UPDATE_INTERVAL = 0.05
+
+# Finished notes keyed by (ai_model, hash of the transcript text), so asking again
+# for the same transcript and model skips Ollama entirely
+_NOTES_CACHE = {}
+
+
+def get_ollama_models():
+    """Fetch available models from Ollama with parameter sizes."""
+    try:
+        import ollama
+        response = ollama.list()
+        # Handle different response formats
+        if hasattr(response, 'models'):
+            models = response.models
+        elif isinstance(response, dict) and 'models' in response:
+            models = response['models']
+        else:
+            models = []
+        
+        model_names = []
+        for m in models:
+            # Get model name
+            if hasattr(m, 'model'):
+                name = m.model.split(':')[0]
+            elif isinstance(m, dict) and 'name' in m:
+                name = m['name'].split(':')[0]
+            elif isinstance(m, dict) and 'model' in m:
+                name = m['model'].split(':')[0]
+            else:
+                continue
+            
+            # Get size in bytes and convert to readable format
+            size_bytes = None
+            if hasattr(m, 'size'):
+                size_bytes = m.size
+            elif isinstance(m, dict) and 'size' in m:
+                size_bytes = m['size']
+            
+            if size_bytes:
+                # Convert to GB and estimate parameters (rough: 2 bytes per param for fp16)
+                size_gb = size_bytes / (1024**3)
+                params_b = size_bytes / (2 * 1024**3)  # Rough estimate
+                if params_b >= 1:
+                    label = f"{name} ({params_b:.1f}B params, {size_gb:.1f}GB)"
+                else:
+                    label = f"{name} ({size_gb:.1f}GB)"
+            else:
+                label = name
+            
+            model_names.append(label)
+        
+        return model_names if model_names else ["No models installed"]
+    except Exception as e:
+        print(f"Error fetching Ollama models: {e}")
+        return ["Ollama not running"]
+
+
+def refresh_models():
+    """Refresh the Ollama model list."""
+    models = get_ollama_models()
+    return gr.update(choices=models, value=models[0] if models else None)
+
+
+def get_progress_queue():
+    """Returns a queue the worker process can report progress through."""
+    global _MANAGER
+    if _MANAGER is None:
+        _MANAGER = mp.get_context("spawn").Manager()
+    return _MANAGER.Queue()
+
+
+def write_text(path, text):
+    """Writes a UTF-8 text file, encoding it once and handing the bytes straight to the OS."""
+    data = memoryview(text.encode("utf-8"))
+    # O_BINARY keeps Windows from translating newlines in the already-encoded bytes
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def unique_name(base_name, used_names):
+    """Returns base_name, or base_name_2, _3, ... if already in used_names (which it then joins)."""
+    name = base_name
+    index = 1
+    while name in used_names:
+        index += 1
+        name = f"{base_name}_{index}"
+    used_names.add(name)
+    return name
+
+
+def wait_for_warmup():
+    """Keeps the Transcribe button disabled until the startup warm-up has finished."""
+    if _WARMUP is not None and not _WARMUP.done():
+        yield gr.update(value="⏳ Loading model...", interactive=False)
+        wait([_WARMUP])
+    yield gr.update(value="▶️ Transcribe", interactive=True)
+
+
+def default_compute_type(device):
+    """Select the recommended compute type when the device changes."""
+    return gr.update(value=pick_compute_type(device))
+
+
+def transcribe_video(video_files, whisper_model, device, compute_type, backend, batch_size, beam_size, state, progress=gr.Progress()):
+    """Transcription only."""
+    global _EXECUTOR
+    
+    if not video_files:
+        return "❌ Please upload a video file first.", "", None, "", state
+    
+    video_paths = [f.name if hasattr(f, 'name') else f for f in video_files]
+    
+    # One output directory per session, reused by every transcription and removed on exit
+    output_dir = state.get("tmpdir")
+    if output_dir is None:
+        output_dir = tempfile.mkdtemp(prefix="v2n_")
+        atexit.register(shutil.rmtree, output_dir, ignore_errors=True)
+        state = dict(state, tmpdir=output_dir)
+    
+    logs = []
+    transcript_parts = []
+    transcript_paths = []
+    writers = []
+    status = ""
+    
+    try:
+        status = f"🔧 Model: {whisper_model} | Device: {device.upper()} | Backend: {backend}"
+        
+        logs.extend((
+            f"🧠 Loading Whisper '{whisper_model}' on {device} ({compute_type})...",
+            f"📦 Extracting audio from {len(video_paths)} video(s)..."
+        ))
+        
+        events = get_progress_queue()
+        future = get_worker().submit(
+            transcribe_videos,
+            video_paths,
+            whisper_model,
+            device,
+            compute_type,
+            backend,
+            int(batch_size),
+            int(beam_size),
+            events
+        )
+        while not future.done():
+            try:
+                fraction, desc = events.get(timeout=0.5)
+                progress(fraction, desc=desc)
+            except queue.Empty:
+                pass
+        results = future.result()
+        
+        videos = []
+        used_names = set()
+        for video_path, all_segments in zip(video_paths, results):
+            file_name = os.path.basename(video_path)
+            base_name = unique_name(os.path.splitext(file_name)[0], used_names)
+            transcript_path = os.path.join(output_dir, f"{base_name}.md")
+            # Notes from an earlier transcript of a same-named video no longer match
+            notes_path = os.path.join(output_dir, f"{base_name}_notes.md")
+            if os.path.exists(notes_path):
+                os.remove(notes_path)
+            logs.append(f"✅ {file_name}: transcribed {len(all_segments)} segments.")
+            
+            # The .md files are written in the background; the textbox shows plain text
+            transcript_md = format_markdown(all_segments)
+            writer = threading.Thread(target=write_text, args=(transcript_path, transcript_md))
+            writer.start()
+            writers.append(writer)
+            
+            transcript_parts.append(f"== {file_name} ==\n{format_transcript_text(all_segments)}")
+            transcript_paths.append(transcript_path)
+            
+            videos.append({"segments": all_segments, "transcript_path": transcript_path})
+        
+        state = {"videos": videos, "tmpdir": output_dir}
+        
+        logs.append("✅ Done! You can now generate AI notes.")
+        progress(1.0, desc="Complete!")
+        status = f"✅ Transcribed {len(videos)} video(s) with {whisper_model} on {device.upper()}"
+        
+    except BrokenProcessPool:
+        # The worker process died (killed for running out of memory, or a crash in a native
+        # library); replace it for the next request
+        _EXECUTOR = start_worker()
+        logs.append("❌ Error: the transcription worker stopped unexpectedly and has been restarted. If this keeps happening, try a smaller model or batch size.")
+        status = "❌ Transcription failed"
+    except Exception as e:
+        logs.append(f"❌ Error: {str(e)}")
+        status = "❌ Transcription failed"
+    
+    # Gradio copies download files when the handler returns, so they must be complete
+    for writer in writers:
+        writer.join()
+    
+    log_output = "\n".join(logs)
+    transcript_text = "\n".join(transcript_parts)
+    transcript_download = transcript_paths or None
+    
+    return log_output, transcript_text, transcript_download, status, state
+
+
+def generate_ai_notes(ai_model_label, state, progress=gr.Progress()):
+    """Generate AI notes from transcription, streaming partial notes into the UI."""
+    # Extract clean model name from label (e.g., "llama3 (8B params, 4.7GB)" -> "llama3")
+    ai_model = ai_model_label.split(' (')[0] if ' (' in ai_model_label else ai_model_label
+    
+    if not state["videos"]:
+        yield "❌ No transcript available. Please transcribe a video first.", "", None, ""
+        return
+    
+    videos = state["videos"]
+    
+    logs = []
+    notes_parts = []
+    notes_paths = []
+    status = f"🤖 Using: {ai_model}"
+    
+    try:
+        progress(0.1, desc="Connecting to Ollama...")
+        logs.append(f"🤖 Generating notes with '{ai_model}'...")
+        
+        from src.ai import stream_tutorial_notes, check_ollama_server, FAILED_SECTION_MARKER
+        
+        if not check_ollama_server():
+            logs.extend(("❌ Ollama server not reachable.", "💡 Run 'ollama serve' in a terminal."))
+            yield "\n".join(logs), "", None, "❌ Ollama not running"
+            return
+        
+        for i, video in enumerate(videos):
+            all_segments = video["segments"]
+            transcript_path = video["transcript_path"]
+            
+            output_dir = os.path.dirname(transcript_path)
+            base_name = os.path.splitext(os.path.basename(transcript_path))[0]
+
+            notes_path = os.path.join(output_dir, f"{base_name}_notes.md")
+            
+            progress(0.2 + 0.7 * i / len(videos), desc=f"Processing {base_name} with {ai_model}...")
+            full_text = format_transcript_text(all_segments)
+            heading = f"**{base_name}**\n\n"
+            key = (ai_model, hashlib.blake2b(full_text.encode("utf-8"), digest_size=16).digest())
+            
+            notes = _NOTES_CACHE.get(key)
+            if notes is not None:
+                # Same transcript and model as before: reuse the notes. The file is rewritten
+                # anyway, since notes from another model may have replaced it since
+                write_text(notes_path, notes)
+                logs.append(f"♻️ {base_name}: reused previously generated notes.")
+            else:
+                parts = []
+                last_update = 0.0
+                for piece in stream_tutorial_notes(full_text, model=ai_model):
+                    parts.append(piece)
+                    # Re-rendering the whole Markdown per token is wasted work; push at most every 50 ms
+                    now = time.monotonic()
+                    if now - last_update >= NOTES_UPDATE_INTERVAL:
+                        last_update = now
+                        partial_notes = "\n\n---\n\n".join(notes_parts + [heading + "".join(parts)])
+                        yield "\n".join(logs), partial_notes, None, status
+                
+                # Only the finished notes go to disk
+                notes = "".join(parts)
+                write_text(notes_path, notes)
+                # Sections that failed should be retried next time, not served from the cache
+                if FAILED_SECTION_MARKER not in notes:
+                    _NOTES_CACHE[key] = notes
+                logs.append(f"✅ {base_name}: AI notes generated!")
+            
+            notes_parts.append(heading + notes)
+            notes_paths.append(notes_path)
+        
+        status = f"✅ Generated with {ai_model}"
+        progress(1.0, desc="Complete!")
+        
+    except Exception as e:
+        logs.append(f"❌ Error: {str(e)}")
+        status = "❌ AI generation failed"
+    
+    log_output = "\n".join(logs)
+    notes_text = "\n\n---\n\n".join(notes_parts)
+    notes_download = notes_paths or None
+    
+    yield log_output, notes_text, notes_download, status
+
+
+# Custom CSS for better styling
+custom_css = """
+.status-box { 
+    padding: 10px; 
+    border-radius: 8px; 
+    background: linear-gradient(135deg, #1a1a2e, #16213e);
+    border: 1px solid #0f3460;
+    font-weight: bold;
+}
+.step-header {
+    font-size: 1.1em;
+    margin-bottom: 10px;
+    color: #e94560;
+}
+"""
+
+def build_ui():
+    """Builds the Gradio interface (this also asks Ollama for its installed models)."""
+    with gr.Blocks(title="Video to Notes", theme=gr.themes.Soft(primary_hue="purple"), css=custom_css) as demo:
+        gr.Markdown("""
+        # 🎥 Video to Notes
+        **Step 1:** Upload video → Transcribe → **Step 2:** Generate AI notes (optional)
+        """)
+        
+        with gr.Row():
+            # LEFT COLUMN - Controls
+            with gr.Column(scale=1):
+                # Step 1: Transcription
+                gr.Markdown("### 📝 Step 1: Transcribe")
+                video_input = gr.Files(label="Upload Videos", file_types=[".mp4", ".mkv", ".avi", ".mov"])
+                
+                with gr.Row():
+                    whisper_model = gr.Dropdown(
+                        choices=[
+                            "tiny", "base", "small", "medium", "large-v2",
+                            # Much faster decoders: distilled (English-only .en) and turbo models
+                            "large-v3-turbo", "distil-small.en", "distil-medium.en", "distil-large-v3"
+                        ],
+                        value="small",
+                        label="Model",
+                        scale=2
+                    )
+                    device = gr.Radio(
+                        choices=["cuda", "cpu"],
+                        value="cpu",
+                        label="Device",
+                        scale=1
+                    )
+                compute_type = gr.Dropdown(
+                    choices=["int8", "int8_float16", "float16", "float32"],
+                    value=pick_compute_type("cpu"),
+                    label="Compute Type",
+                    info="int8 is fastest on CPU; int8_float16 on modern NVIDIA GPUs"
+                )
+                backend = gr.Dropdown(
+                    choices=list(BACKENDS),
+                    value=DEFAULT_BACKEND,
+                    label="Backend"
+                )
+                with gr.Accordion("Advanced", open=False):
+                    batch_size = gr.Slider(
+                        minimum=1,
+                        maximum=32,
+                        value=16,
+                        step=1,
+                        label="Batch Size",
+                        info="Chunks decoded together on CUDA; lower it if the GPU runs out of memory"
+                    )
+                beam_size = gr.Slider(
+                    minimum=1,
+                    maximum=5,
+                    value=1,
+                    step=1,
+                    label="Beam Size",
+                    info="1 = fastest; higher = slightly more accurate but slower"
+                )
+                
+                transcribe_btn = gr.Button("▶️ Transcribe", variant="primary", size="lg")
+                transcribe_status = gr.Textbox(label="Status", interactive=False, elem_classes="status-box")
+                
+                gr.Markdown("---")
+                
+                # Step 2: AI Notes
+                gr.Markdown("### 🤖 Step 2: AI Notes")
+                with gr.Row():
+                    ai_model = gr.Dropdown(
+                        choices=get_ollama_models(),
+                        label="Ollama Model",
+                        scale=3
+                    )
+                    refresh_btn = gr.Button("🔄", scale=1, size="sm")
+                
+                ai_btn = gr.Button("✨ Generate Notes", variant="secondary", size="lg")
+                ai_status = gr.Textbox(label="Status", interactive=False, elem_classes="status-box")
+            
+            # RIGHT COLUMN - Output
+            with gr.Column(scale=2):
+                log_output = gr.Textbox(label="📋 Logs", lines=5, interactive=False)
+                
+                with gr.Tabs():
+                    with gr.TabItem("📄 Transcript"):
+                        # Plain text: long transcripts would stall the browser's Markdown renderer
+                        transcript_output = gr.Textbox(
+                            show_label=False,
+                            lines=20,
+                            max_lines=40,
+                            interactive=False,
+                            show_copy_button=True
+                        )
+                        transcript_download = gr.File(label="Download", file_count="multiple")
+                    
+                    with gr.TabItem("📝 AI Notes"):
+                        notes_output = gr.Markdown()
+                        notes_download = gr.File(label="Download", file_count="multiple")
+        
+        # Per-session transcripts: one {"segments" (a Segments), "transcript_path"} entry per video,
+        # plus "tmpdir", the session's output directory once something has been transcribed
+        session_state = gr.State({"videos": []})
+        
+        # Event handlers
+        # Waiting here must not hold up other sessions' events, hence no concurrency limit
+        demo.load(fn=wait_for_warmup, outputs=[transcribe_btn], concurrency_limit=None)
+        refresh_btn.click(fn=refresh_models, outputs=[ai_model])
+        device.change(fn=default_compute_type, inputs=[device], outputs=[compute_type])
+        
+        transcribe_btn.click(
+            fn=transcribe_video,
+            inputs=[video_input, whisper_model, device, compute_type, backend, batch_size, beam_size, session_state],
+            outputs=[log_output, transcript_output, transcript_download, transcribe_status, session_state]
+        )
+        
+        ai_btn.click(
+            fn=generate_ai_notes,
+            inputs=[ai_model, session_state],
+            outputs=[log_output, notes_output, notes_download, ai_status],
+            api_name="generate_notes",
+            # Sessions no longer share transcripts, so several users can stream notes at once
+            concurrency_limit=4
+        )
+        
+    return demo
+
+def launch():
+    """Starts the worker warm-up and serves the UI."""
+    global _WARMUP
+    
+    # Pre-load and warm up the UI's default Whisper configuration in the worker so the first
+    # click doesn't pay for it; the Transcribe button stays disabled until this finishes
+    _WARMUP = get_worker().submit(preload_model, "small", "cpu", pick_compute_type("cpu"), DEFAULT_BACKEND)
+    
+    demo = build_ui()
+    # One transcription at a time per event (they share the single worker); cap the backlog
+    demo.queue(default_concurrency_limit=1, max_size=20)
+    demo.launch(inbrowser=True)
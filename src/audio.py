@@ -1,37 +1,103 @@
-
 import os
-import subprocess
+import threading
+import wave
+import numpy as np
 import ffmpeg
 
-def extract_audio(video_path: str, output_path: str = "temp_audio.wav") -> str:
+SAMPLE_RATE = 16000
+READ_BLOCK_SIZE = 1 << 20  # bytes of PCM read from ffmpeg at a time
+
+def extract_audio(video_path: str) -> np.ndarray:
     """
     Extracts audio from a video file using ffmpeg-python.
-    Converts to 16kHz mono WAV which is optimal for Whisper.
+    Decodes to 16kHz mono PCM which is optimal for Whisper, streamed
+    through ffmpeg's stdout so no temporary WAV file touches the disk.
     
     Args:
         video_path (str): Path to the input video file.
-        output_path (str): Path to save the extracted audio.
         
     Returns:
-        str: Path to the extracted audio file.
+        np.ndarray: float32 samples in [-1, 1).
+    
+    Raises:
+        RuntimeError: If ffmpeg fails, with its error output as the message.
     """
     if not os.path.exists(video_path):
         raise FileNotFoundError(f"Video file not found: {video_path}")
 
-    try:
-        (
-            ffmpeg
-            .input(video_path)
-            .output(output_path, ac=1, ar='16000') 
-            .overwrite_output()
-            .run(quiet=True)
+    # Pre-size the output from the container's duration so samples are converted
+    # in place as they stream in, instead of holding the raw PCM and a float copy
+    audio = np.empty(estimate_samples(video_path), np.float32)
+    filled = 0
+
+    process = (
+        ffmpeg
+        .input(video_path)
+        # Only the first audio stream is mapped and video, subtitle and data streams are
+        # disabled (-vn -sn -dn), so ffmpeg never decodes the (much more expensive) video frames
+        .output(
+            "pipe:",
+            map="0:a:0",
+            vn=None,
+            sn=None,
+            dn=None,
+            format="s16le",
+            acodec="pcm_s16le",
+            ac=1,
+            ar=SAMPLE_RATE,
+            threads=0
         )
-        return output_path
-    except ffmpeg.Error as e:
-        print(f"Error extracting audio: {e.stderr.decode() if e.stderr else str(e)}")
-        raise
-
-def cleanup_audio(audio_path: str):
-    """Removes the temporary audio file."""
-    if os.path.exists(audio_path):
-        os.remove(audio_path)
+        .global_args("-hide_banner", "-nostats", "-loglevel", "error")
+        .run_async(pipe_stdout=True, pipe_stderr=True)
+    )
+
+    # A damaged stream logs an error per bad packet, so stderr is drained alongside
+    # stdout: once its pipe filled up, ffmpeg would block and stdout would never end
+    stderr_blocks = []
+    drainer = threading.Thread(target=lambda: stderr_blocks.append(process.stderr.read()), daemon=True)
+    drainer.start()
+
+    while True:
+        block = process.stdout.read(READ_BLOCK_SIZE)
+        if not block:
+            break
+        samples = np.frombuffer(block, np.int16)
+        if filled + len(samples) > len(audio):
+            # Duration was unknown or underestimated
+            grown = np.empty(max(2 * len(audio), filled + len(samples)), np.float32)
+            grown[:filled] = audio[:filled]
+            audio = grown
+        # Scale in float32 directly instead of dividing the int16 samples
+        np.multiply(samples, np.float32(1.0 / 32768.0), out=audio[filled:filled + len(samples)])
+        filled += len(samples)
+
+    process.wait()
+    drainer.join()
+    process.stdout.close()
+    process.stderr.close()
+    stderr = stderr_blocks[0] if stderr_blocks else b""
+    if process.returncode != 0:
+        message = stderr.decode(errors="replace").strip() if stderr else f"exit code {process.returncode}"
+        # A plain RuntimeError rather than ffmpeg.Error, which can't be pickled back
+        # from the worker process (and would break its pool)
+        raise RuntimeError(f"Error extracting audio from {os.path.basename(video_path)}: {message}")
+
+    return audio[:filled]
+
+def estimate_samples(video_path: str) -> int:
+    """Estimates the number of 16kHz samples in a video from its container duration."""
+    try:
+        duration = float(ffmpeg.probe(video_path)["format"]["duration"])
+    except (ffmpeg.Error, OSError, KeyError, ValueError):
+        duration = 0.0
+    # One second of headroom for rounding; extract_audio grows the buffer if needed
+    return int((duration + 1) * SAMPLE_RATE)
+
+def save_audio(audio: np.ndarray, output_path: str):
+    """Writes extracted audio samples to a 16kHz mono WAV file."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767.0).astype(np.int16)
+    with wave.open(output_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
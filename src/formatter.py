@@ -1,5 +1,65 @@
 
+import io
 import json
+import numpy as np
+from dataclasses import dataclass
+from typing import List
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the (slower) stdlib encoder
+    orjson = None
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
+FLUSH_EVERY = 100  # segments
+MARKDOWN_HEADER = "# Video Transcript\n\n"
+# Line templates, filled with (start, end, text)
+MARKDOWN_LINE = "**{} - {}**: {}\n"
+TRANSCRIPT_LINE = "[{}-{}] {}\n"
+
+# MM:SS strings indexed by whole second, shared by format_timestamps and
+# transcriber.format_timestamp
+_TIMESTAMP_TABLE: List[str] = []
+
+@dataclass
+class Segments:
+    """
+    Transcript segments stored column-wise instead of one dict per segment.
+    
+    Start and end times are float64 arrays of seconds next to a plain list of
+    texts. This is several times smaller than a list of dicts, pickles back
+    from the worker process in one piece, and lets the formatters render the
+    timestamps for all segments at once. Iterating yields the usual segment
+    dicts for code that expects them.
+    """
+    starts: np.ndarray
+    ends: np.ndarray
+    texts: List[str]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def __iter__(self):
+        for start, end, text in zip(format_timestamps(self.starts), format_timestamps(self.ends), self.texts):
+            yield {"start": start, "end": end, "text": text}
+
+def format_timestamps(seconds: np.ndarray) -> List[str]:
+    """Formats an array of seconds as MM:SS strings, like format_timestamp but column-wise."""
+    whole = seconds.astype(np.int64)
+    table = timestamp_table(int(whole.max()) + 1 if len(whole) else 0)
+    # One C-level lookup per segment instead of formatting each timestamp again
+    return list(map(table.__getitem__, whole.tolist()))
+
+def timestamp_table(size: int) -> List[str]:
+    """Returns MM:SS strings for at least the first `size` whole seconds."""
+    global _TIMESTAMP_TABLE
+    table = _TIMESTAMP_TABLE
+    if len(table) < size:
+        # Grow in whole hours; the new list replaces the old one in a single assignment
+        size = -(-size // 3600) * 3600
+        table = [f"{second // 60:02d}:{second % 60:02d}" for second in range(size)]
+        _TIMESTAMP_TABLE = table
+    return table
 
 def save_transcript(transcript_generator, output_path: str, format: str = "markdown"):
     """
@@ -12,15 +72,51 @@ def save_transcript(transcript_generator, output_path: str, format: str = "markd
     """
     if format == "json":
         data = list(transcript_generator)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
     else:
         # Default to Markdown
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Video Transcript\n\n")
-            for segment in transcript_generator:
-                line = f"**{segment['start']} - {segment['end']}**: {segment['text']}\n"
-                f.write(line)
-                # Determine if we should flush to disk periodically? 
-                # For now, writing line by line is safer for long generations if we crash.
-                f.flush() 
+        with open(output_path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(MARKDOWN_HEADER)
+            for i, segment in enumerate(transcript_generator, 1):
+                f.write(format_markdown_line(segment))
+                # Flush periodically so a crash mid-transcription still leaves most of the
+                # transcript on disk, without paying a syscall per segment.
+                if i % FLUSH_EVERY == 0:
+                    f.flush()
+
+def format_markdown_line(segment) -> str:
+    """Formats a single segment as a Markdown transcript line."""
+    return MARKDOWN_LINE.format(segment['start'], segment['end'], segment['text'])
+
+def format_markdown(segments) -> str:
+    """Formats segments as the same Markdown document save_transcript writes."""
+    buf = io.StringIO()
+    buf.write(MARKDOWN_HEADER)
+    if isinstance(segments, Segments):
+        buf.writelines(map(MARKDOWN_LINE.format, format_timestamps(segments.starts), format_timestamps(segments.ends), segments.texts))
+    else:
+        buf.writelines(map(format_markdown_line, segments))
+    return buf.getvalue()
+
+def format_transcript_text(segments) -> str:
+    """
+    Formats segments as plain "[start-end] text" lines for the LLM.
+    
+    Writes into a single StringIO buffer rather than building a list of
+    per-segment strings to join, which keeps peak memory low for long videos.
+    """
+    buf = io.StringIO()
+    if isinstance(segments, Segments):
+        buf.writelines(map(TRANSCRIPT_LINE.format, format_timestamps(segments.starts), format_timestamps(segments.ends), segments.texts))
+        return buf.getvalue()
+
+    write = buf.write  # bound once; this loop runs once per segment
+    line = TRANSCRIPT_LINE.format
+    for s in segments:
+        write(line(s['start'], s['end'], s['text']))
+    return buf.getvalue()
@@ -1,42 +1,355 @@
 
 import os
-from faster_whisper import WhisperModel
-from datetime import timedelta
+import tempfile
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from src.formatter import timestamp_table
+
+# faster-whisper and CTranslate2 take seconds to import, so they are imported where
+# used: the UI process only needs the helpers and constants from this module
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
+
+# Supported transcription backends. Only faster-whisper is installed by default;
+# the others are optional and imported when selected.
+BACKENDS = ("faster-whisper", "whisper-s2t", "whisper-jax", "tensorrt-llm")
+
+# Pre-built TensorRT-LLM Whisper engines, used by default when configured
+TRT_ENGINE_DIR = os.environ.get("TRT_ENGINE_DIR")
+DEFAULT_BACKEND = "tensorrt-llm" if TRT_ENGINE_DIR else "faster-whisper"
+
+# Where faster-whisper models are downloaded to; point it at a persistent volume in
+# containers. Unset uses the Hugging Face cache (HF_HOME).
+MODEL_CACHE_DIR = os.environ.get("WHISPER_CACHE_DIR")
+# Files a cached faster-whisper model can't load without
+MODEL_FILES = ("model.bin", "config.json")
+
+# Silero VAD tuning: only pauses of at least half a second split speech
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+# On CPU, VAD-split chunks of up to CHUNK_SECONDS are decoded by CPU_WORKERS concurrent
+# model replicas, each with its own small intra-op thread pool, so every core stays busy
+CHUNK_SECONDS = 30
+CPU_THREADS_PER_WORKER = 2
+CPU_WORKERS = max(1, (os.cpu_count() or 1) // CPU_THREADS_PER_WORKER)
+
+# Loaded models keyed by (backend, model_size, device, compute_type, parallel_chunks), least
+# recently used first. Each model holds GBs of (V)RAM, so only the most recent few are kept.
+MAX_CACHED_MODELS = 2
+_MODEL_CACHE: "OrderedDict[Tuple[str, str, str, str, bool], Any]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
 
 def format_timestamp(seconds: float) -> str:
     """Formats seconds into MM:SS string."""
-    td = timedelta(seconds=seconds)
-    total_seconds = int(td.total_seconds())
-    minutes, remainder = divmod(total_seconds, 60)
-    return f"{minutes:02d}:{remainder:02d}"
+    # Same whole-second table as the column-wise formatter, so both always agree
+    whole = int(seconds)
+    return timestamp_table(whole + 1)[whole]
 
-def transcribe_audio(audio_path: str, model_size: str = "medium", device: str = "cuda", compute_type: str = "float16"):
+def pick_compute_type(device: str) -> str:
     """
-    Transcribes audio file using faster-whisper.
+    Picks the fastest quantization type for the given device.
+    
+    int8 weights with float16 activations on Tensor-Core GPUs (SM >= 7.0),
+    plain float16 on older GPUs, and int8 on CPU.
+    """
+    if device != "cuda":
+        return "int8"
+    import ctranslate2
+
+    try:
+        # CTranslate2 only reports int8_float16 when the GPU has Tensor Cores
+        supported = ctranslate2.get_supported_compute_types("cuda")
+    except Exception:
+        # No usable GPU or a CPU-only build: leave the error to model loading, as before
+        return "float16"
+    return "int8_float16" if "int8_float16" in supported else "float16"
+
+def get_model(model_size: str, device: str, compute_type: str, backend: str = DEFAULT_BACKEND, parallel_chunks: bool = True):
+    """
+    Returns a cached model for the given backend, loading it on first use.
+    
+    Loading allocates several GB and takes seconds, so repeated
+    transcriptions with the same settings reuse the same instance.
+    parallel_chunks (on for VAD transcription) lays out a CPU model's
+    threads for decoding many chunks at once instead of one at a time.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(BACKENDS)}")
+
+    # Only a CPU faster-whisper model is laid out differently, so every other
+    # combination shares one cache entry whatever the caller asked for
+    parallel_chunks = parallel_chunks and device == "cpu" and backend == "faster-whisper"
+    key = (backend, model_size, device, compute_type, parallel_chunks)
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+        else:
+            # Make room before loading so the evicted model's memory can be reused
+            while len(_MODEL_CACHE) >= MAX_CACHED_MODELS:
+                _MODEL_CACHE.popitem(last=False)
+            
+            print(f"Loading Whisper model '{model_size}' on {device} ({backend})...")
+            if backend == "whisper-s2t":
+                model = load_whisper_s2t(model_size, device, compute_type)
+            elif backend == "whisper-jax":
+                model = load_whisper_jax(model_size, compute_type)
+            elif backend == "tensorrt-llm":
+                model = load_tensorrt_llm()
+            else:
+                model = load_faster_whisper(model_size, device, compute_type, parallel_chunks)
+            _MODEL_CACHE[key] = model
+    return model
+
+def load_faster_whisper(model_size: str, device: str, compute_type: str, parallel_chunks: bool = True):
+    """Loads a faster-whisper model, optionally sized for concurrent chunk decoding on CPU."""
+    from faster_whisper import WhisperModel
+
+    if device == "cpu" and parallel_chunks:
+        return WhisperModel(
+            model_path(model_size),
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=CPU_THREADS_PER_WORKER,
+            num_workers=CPU_WORKERS
+        )
+    # Sequential decoding keeps faster-whisper's default of 4 threads for the single decoder
+    return WhisperModel(model_path(model_size), device=device, compute_type=compute_type)
+
+def model_path(model_size: str) -> str:
+    """
+    Returns the local directory holding a faster-whisper model, downloading it on first use.
+    
+    Once the model is in MODEL_CACHE_DIR it is loaded without contacting the
+    Hugging Face Hub, so restarts skip the network round-trip (and work offline).
+    Paths to converted CTranslate2 model directories are returned unchanged.
+    """
+    if os.path.isdir(model_size):
+        return model_size
+
+    import huggingface_hub
+    from faster_whisper.utils import _MODELS, download_model
+
+    # Look in the cache directly: download_model treats a cache miss as a failed
+    # Hub sync and logs warnings about it
+    try:
+        path = huggingface_hub.snapshot_download(
+            _MODELS.get(model_size, model_size),
+            cache_dir=MODEL_CACHE_DIR,
+            local_files_only=True
+        )
+        # An interrupted first download leaves a snapshot folder without the weights
+        if all(os.path.isfile(os.path.join(path, name)) for name in MODEL_FILES):
+            return path
+    except (FileNotFoundError, ValueError):
+        # Not cached yet (LocalEntryNotFoundError), or not a valid repo id; download_model
+        # downloads the former and reports the latter as an invalid model size
+        pass
+    return download_model(model_size, cache_dir=MODEL_CACHE_DIR)
+
+def transcribe_audio(audio: Union[str, np.ndarray], model_size: str = "medium", device: str = "cuda", compute_type: str = "float16", batch_size: int = 16, beam_size: int = 1, vad_filter: bool = True, backend: str = DEFAULT_BACKEND):
+    """
+    Transcribes audio file using faster-whisper or another supported backend.
     
     Args:
-        audio_path (str): Path to the audio file.
+        audio (str | np.ndarray): Path to an audio file, or 16kHz mono float32 samples.
         model_size (str): Whisper model size (tiny, base, small, medium, large-v2).
         device (str): Device to run the model on ('cuda' or 'cpu').
         compute_type (str): Quantization type ('float16', 'int8_float16', 'int8').
+        batch_size (int): Number of VAD-split chunks decoded in parallel.
+        beam_size (int): Beam width for decoding (1 = greedy, fastest).
+        vad_filter (bool): Skip silent regions with Silero VAD (faster-whisper backend).
+        backend (str): One of BACKENDS.
+        
+    Yields:
+        dict: Segment data containing start_time, end_time, and text.
+    """
+    model = get_model(model_size, device, compute_type, backend=backend, parallel_chunks=vad_filter)
+    yield from transcribe_with_model(model, audio, batch_size=batch_size, beam_size=beam_size, vad_filter=vad_filter, backend=backend)
+
+def transcribe_with_model(model, audio: Union[str, np.ndarray], batch_size: int = 16, beam_size: int = 1, vad_filter: bool = True, backend: str = DEFAULT_BACKEND):
+    """
+    Transcribes audio file with an already loaded model.
+    
+    Lets callers load the model (see get_model) while audio extraction
+    is still running.
+    
+    Args:
+        model: Model returned by get_model for the same backend.
+        audio (str | np.ndarray): Path to an audio file, or 16kHz mono float32 samples.
+        batch_size (int): Number of VAD-split chunks decoded in parallel.
+        beam_size (int): Beam width for decoding (1 = greedy, fastest).
+        vad_filter (bool): Skip silent regions with Silero VAD (faster-whisper backend).
+        backend (str): One of BACKENDS.
         
     Yields:
         dict: Segment data containing start_time, end_time, and text.
     """
-    if not os.path.exists(audio_path):
-        raise FileNotFoundError(f"Audio file not found: {audio_path}")
+    for start, end, text in transcribe_raw(model, audio, batch_size=batch_size, beam_size=beam_size, vad_filter=vad_filter, backend=backend):
+        yield {
+            "start": format_timestamp(start),
+            "end": format_timestamp(end),
+            "text": text
+        }
 
-    print(f"Loading Whisper model '{model_size}' on {device}...")
-    model = WhisperModel(model_size, device=device, compute_type=compute_type)
+def transcribe_raw(model, audio: Union[str, np.ndarray], batch_size: int = 16, beam_size: int = 1, vad_filter: bool = True, backend: str = DEFAULT_BACKEND):
+    """
+    Like transcribe_with_model, but yields (start, end, text) tuples with the
+    timestamps left as seconds, for callers that store them numerically.
+    """
+    if isinstance(audio, str) and not os.path.exists(audio):
+        raise FileNotFoundError(f"Audio file not found: {audio}")
 
     print("Transcribing audio...")
-    segments, info = model.transcribe(audio_path, beam_size=5)
+    if backend == "whisper-s2t":
+        segments = transcribe_whisper_s2t(model, audio, batch_size=batch_size)
+    elif backend == "whisper-jax":
+        segments = transcribe_whisper_jax(model, audio, batch_size=batch_size)
+    elif backend == "tensorrt-llm":
+        segments = model.transcribe(audio, batch_size=batch_size)
+    else:
+        segments = transcribe_faster_whisper(model, audio, batch_size=batch_size, beam_size=beam_size, vad_filter=vad_filter)
+
+    for start, end, text in segments:
+        yield start, end, text.strip()
+
+def transcribe_faster_whisper(model: "WhisperModel", audio, batch_size: int, beam_size: int, vad_filter: bool = True):
+    """Yields (start, end, text) tuples using faster-whisper, batched on GPU and multi-threaded on CPU."""
+    if vad_filter and model.model.device == "cpu":
+        yield from transcribe_vad_chunks(model, audio, beam_size=beam_size)
+        return
+
+    if vad_filter:
+        from faster_whisper import BatchedInferencePipeline
+
+        # Batch VAD-split chunks through the model instead of decoding 30s windows serially
+        pipeline = BatchedInferencePipeline(model=model)
+        segments, info = pipeline.transcribe(
+            audio,
+            batch_size=batch_size,
+            beam_size=beam_size,
+            vad_filter=True,
+            vad_parameters=VAD_PARAMETERS,
+            without_timestamps=False
+        )
+    else:
+        # The batched pipeline needs VAD boundaries to split long audio, so decode sequentially
+        segments, info = model.transcribe(audio, beam_size=beam_size)
 
     print(f"Detected language '{info.language}' with probability {info.language_probability:.2f}")
 
     for segment in segments:
-        yield {
-            "start": format_timestamp(segment.start),
-            "end": format_timestamp(segment.end),
-            "text": segment.text.strip()
-        }
+        yield segment.start, segment.end, segment.text
+
+def transcribe_vad_chunks(model: "WhisperModel", audio, beam_size: int):
+    """
+    Yields (start, end, text) tuples by transcribing VAD-split chunks concurrently.
+    
+    The audio is cut at pauses into chunks of at most CHUNK_SECONDS, and the
+    chunks are decoded on CPU_WORKERS threads (CTranslate2 releases the GIL).
+    Segments come back in order, with timestamps shifted to the full audio.
+    """
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import VadOptions, get_speech_timestamps, merge_segments
+    from src.audio import SAMPLE_RATE
+
+    if isinstance(audio, str):
+        audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+    vad_options = VadOptions(**VAD_PARAMETERS, max_speech_duration_s=CHUNK_SECONDS)
+    chunks = merge_segments(get_speech_timestamps(audio, vad_options), vad_options)
+    if not chunks:
+        return
+
+    # Detect the language once so every chunk is decoded the same way
+    if model.model.is_multilingual:
+        language, probability, _ = model.detect_language(audio[chunks[0]["start"]:chunks[0]["end"]])
+        print(f"Detected language '{language}' with probability {probability:.2f}")
+    else:
+        # English-only models (*.en) have no language tokens to detect with
+        language = "en"
+
+    def transcribe_chunk(chunk):
+        segments, _ = model.transcribe(
+            audio[chunk["start"]:chunk["end"]],
+            language=language,
+            beam_size=beam_size,
+            without_timestamps=False
+        )
+        offset = chunk["start"] / SAMPLE_RATE
+        return [(offset + segment.start, offset + segment.end, segment.text) for segment in segments]
+
+    with ThreadPoolExecutor(max_workers=CPU_WORKERS) as executor:
+        for segments in executor.map(transcribe_chunk, chunks):
+            yield from segments
+
+def load_whisper_s2t(model_size: str, device: str, compute_type: str):
+    """Loads a WhisperS2T model on its CTranslate2 backend (pip install whisper-s2t)."""
+    import whisper_s2t
+    return whisper_s2t.load_model(
+        model_identifier=model_size,
+        backend="CTranslate2",
+        device=device,
+        compute_type=compute_type
+    )
+
+def transcribe_whisper_s2t(model, audio, batch_size: int):
+    """Yields (start, end, text) tuples using WhisperS2T's VAD + dynamic batching."""
+    from src.audio import save_audio
+
+    # WhisperS2T reads its input from files
+    temp_path = None
+    if isinstance(audio, np.ndarray):
+        fd, temp_path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        save_audio(audio, temp_path)
+        audio = temp_path
+
+    try:
+        # WhisperS2T needs the language up front; tutorials are assumed to be English
+        outputs = model.transcribe_with_vad(
+            [audio],
+            lang_codes=["en"],
+            tasks=["transcribe"],
+            initial_prompts=[None],
+            batch_size=batch_size
+        )
+    finally:
+        if temp_path:
+            os.remove(temp_path)
+
+    for segment in outputs[0]:
+        yield segment["start_time"], segment["end_time"], segment["text"]
+
+def load_whisper_jax(model_size: str, compute_type: str):
+    """Loads a Whisper-JAX pipeline (pip install whisper-jax); JAX picks the device."""
+    import jax.numpy as jnp
+    from whisper_jax import FlaxWhisperPipline
+
+    dtype = jnp.float32 if compute_type == "float32" else jnp.bfloat16
+    return FlaxWhisperPipline(f"openai/whisper-{model_size}", dtype=dtype)
+
+def transcribe_whisper_jax(model, audio, batch_size: int):
+    """Yields (start, end, text) tuples using Whisper-JAX's pmap-parallel pipeline."""
+    from src.audio import SAMPLE_RATE
+
+    if isinstance(audio, np.ndarray):
+        audio = {"array": audio, "sampling_rate": SAMPLE_RATE}
+
+    outputs = model(audio, task="transcribe", return_timestamps=True, batch_size=batch_size)
+
+    for chunk in outputs["chunks"]:
+        start, end = chunk["timestamp"]
+        # The final chunk may have no end timestamp
+        yield start, end if end is not None else start, chunk["text"]
+
+def load_tensorrt_llm():
+    """Loads the TensorRT-LLM engines from TRT_ENGINE_DIR (model size and compute type are baked in)."""
+    if not TRT_ENGINE_DIR:
+        raise ValueError("The tensorrt-llm backend requires the TRT_ENGINE_DIR environment variable.")
+
+    from src.transcriber_trt import TRTWhisperModel
+    return TRTWhisperModel(TRT_ENGINE_DIR)
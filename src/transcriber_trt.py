@@ -0,0 +1,115 @@
+import json
+import os
+import numpy as np
+from typing import Union
+from faster_whisper.audio import decode_audio
+from faster_whisper.feature_extractor import FeatureExtractor
+from faster_whisper.tokenizer import Tokenizer
+from src.audio import SAMPLE_RATE
+from src.transcriber import CHUNK_SECONDS
+
+# Whisper's decoder holds 448 positions; half of that is plenty for 30s of speech
+MAX_NEW_TOKENS = 224
+# English-only (*.en) models have 51864 tokens; multilingual ones 51865 (51866 for large-v3)
+MULTILINGUAL_VOCAB_SIZE = 51865
+
+class TRTWhisperModel:
+    """
+    Whisper running on TensorRT-LLM engines.
+    
+    Expects the engine directory produced by TensorRT-LLM's examples/whisper
+    build step (with `encoder/` and `decoder/` sub-directories). Requires
+    `tensorrt_llm` and `torch` with CUDA.
+    """
+
+    def __init__(self, engine_dir: str):
+        from tensorrt_llm.runtime import ModelRunnerCpp
+        import tokenizers
+
+        with open(os.path.join(engine_dir, "encoder", "config.json"), encoding="utf-8") as f:
+            self.n_mels = json.load(f)["pretrained_config"]["n_mels"]
+        with open(os.path.join(engine_dir, "decoder", "config.json"), encoding="utf-8") as f:
+            multilingual = json.load(f)["pretrained_config"]["vocab_size"] >= MULTILINGUAL_VOCAB_SIZE
+
+        self.feature_extractor = FeatureExtractor(feature_size=self.n_mels)
+        self.n_frames = self.feature_extractor.nb_max_frames
+
+        # Use a tokenizer.json shipped next to the engines when present,
+        # otherwise fetch the matching tokenizer from the Hub
+        tokenizer_path = os.path.join(engine_dir, "tokenizer.json")
+        if os.path.exists(tokenizer_path):
+            hf_tokenizer = tokenizers.Tokenizer.from_file(tokenizer_path)
+        else:
+            if not multilingual:
+                # All English-only models share one tokenizer
+                hf_name = "openai/whisper-tiny.en"
+            elif self.n_mels == 128:
+                hf_name = "openai/whisper-large-v3"
+            else:
+                hf_name = "openai/whisper-large-v2"
+            hf_tokenizer = tokenizers.Tokenizer.from_pretrained(hf_name)
+        if multilingual:
+            # The engine decodes without a language-detection pass, so the language is fixed
+            self.tokenizer = Tokenizer(hf_tokenizer, multilingual=True, task="transcribe", language="en")
+        else:
+            # English-only models take no language or task tokens after <|startoftranscript|>
+            self.tokenizer = Tokenizer(hf_tokenizer, multilingual=False)
+
+        self.runner = ModelRunnerCpp.from_dir(
+            engine_dir=engine_dir,
+            is_enc_dec=True,
+            max_input_len=self.n_frames,
+            max_output_len=MAX_NEW_TOKENS,
+            max_beam_width=1
+        )
+
+    def transcribe(self, audio: Union[str, np.ndarray], batch_size: int = 16):
+        """
+        Transcribes audio in fixed 30s windows, decoding `batch_size` windows at a time.
+        
+        Yields:
+            tuple: (start, end, text) for each non-empty window, in seconds.
+        """
+        import torch
+
+        if isinstance(audio, str):
+            audio = decode_audio(audio, sampling_rate=SAMPLE_RATE)
+
+        window_size = CHUNK_SECONDS * SAMPLE_RATE
+        starts = list(range(0, len(audio), window_size))
+        prompt = torch.tensor(self.tokenizer.sot_sequence + [self.tokenizer.no_timestamps], dtype=torch.int32)
+
+        for i in range(0, len(starts), batch_size):
+            batch_starts = starts[i:i + batch_size]
+
+            features = []
+            for start in batch_starts:
+                window = audio[start:start + window_size]
+                window = np.pad(window, (0, window_size - len(window)))
+                features.append(self.feature_extractor(window, padding=0)[:, :self.n_frames])
+
+            # The runner takes (frames, n_mels) float16 features per request. Stage the whole
+            # batch in pinned host memory so it goes to the GPU as one asynchronous copy
+            # instead of one synchronous bounce-buffered copy per window.
+            batch = torch.from_numpy(np.stack(features)).transpose(1, 2).contiguous().half()
+            mels = list(batch.pin_memory().cuda(non_blocking=True).unbind(0))
+
+            mel_lengths = torch.full((len(mels),), self.n_frames, dtype=torch.int32)
+            outputs = self.runner.generate(
+                batch_input_ids=[prompt] * len(mels),
+                encoder_input_features=mels,
+                encoder_output_lengths=mel_lengths // 2,
+                max_new_tokens=MAX_NEW_TOKENS,
+                end_id=self.tokenizer.eot,
+                pad_id=self.tokenizer.eot,
+                num_beams=1,
+                return_dict=True
+            )
+            torch.cuda.synchronize()
+            output_ids = outputs["output_ids"].cpu().numpy().tolist()
+
+            for start, beams in zip(batch_starts, output_ids):
+                text = self.tokenizer.decode(beams[0]).strip()
+                if text:
+                    end = min(start + window_size, len(audio))
+                    yield start / SAMPLE_RATE, end / SAMPLE_RATE, text
@@ -0,0 +1,93 @@
+import os
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from src.audio import extract_audio, SAMPLE_RATE
+from src.formatter import Segments
+from src.transcriber import transcribe_raw, get_model
+
+# Number of videos whose audio is extracted at the same time
+EXTRACT_WORKERS = 4
+
+def preload_model(model_size: str, device: str, compute_type: str, backend: str):
+    """
+    Loads a model into this process's cache (the model itself can't be pickled back).
+    
+    Also decodes a second of silence, so one-off setup such as allocating
+    buffers happens now rather than during the first real transcription.
+    """
+    model = get_model(model_size, device, compute_type, backend)
+    silence = np.zeros(SAMPLE_RATE, np.float32)
+    # VAD would discard the silence before it reaches the model
+    for _ in transcribe_raw(model, silence, vad_filter=False, backend=backend):
+        pass
+
+def transcribe_videos(video_paths, model_size, device, compute_type, backend, batch_size, beam_size, events=None):
+    """
+    Extracts and transcribes a batch of videos.
+    
+    Meant to run in a worker process, so a crash or CUDA out-of-memory error
+    can't take down the caller. Everything returned is plain picklable data.
+    
+    Args:
+        video_paths (list): Paths to the input video files.
+        model_size (str): Whisper model size.
+        device (str): Device to run the model on ('cuda' or 'cpu').
+        compute_type (str): Quantization type.
+        backend (str): Transcription backend.
+        batch_size (int): Number of VAD-split chunks decoded in parallel.
+        beam_size (int): Beam width for decoding.
+        events: Optional queue receiving (fraction, description) progress tuples.
+    
+    Returns:
+        list: One Segments per video, in input order.
+    """
+    def report(fraction, desc):
+        if events is not None:
+            events.put((fraction, desc))
+
+    # Load the Whisper model in the background while ffmpeg extracts the audio
+    executor = ThreadPoolExecutor(max_workers=1)
+    model_future = executor.submit(get_model, model_size, device, compute_type, backend)
+    executor.shutdown(wait=False)
+
+    report(0.1, "Extracting audio...")
+    # Each ffmpeg runs in its own process, so the videos are decoded concurrently.
+    # A decoded track is hundreds of MB for a long video, so only EXTRACT_WORKERS of
+    # them exist at once: the next extraction starts when a transcribed one is dropped.
+    results = []
+    with ThreadPoolExecutor(max_workers=min(len(video_paths), EXTRACT_WORKERS)) as extractor:
+        pending = deque(extractor.submit(extract_audio, path) for path in video_paths[:EXTRACT_WORKERS])
+        for i, video_path in enumerate(video_paths):
+            audio = pending.popleft().result()
+            if i == 0:
+                report(0.3, f"Loading {model_size} model...")
+                model = model_future.result()
+
+            file_name = os.path.basename(video_path)
+            duration = max(len(audio) / SAMPLE_RATE, 1.0)
+
+            report(0.3 + 0.6 * i / len(video_paths), f"Transcribing {file_name}...")
+            segments = transcribe_raw(
+                model,
+                audio,
+                batch_size=batch_size,
+                beam_size=beam_size,
+                backend=backend
+            )
+
+            starts, ends, texts = [], [], []
+            for count, (start, end, text) in enumerate(segments, 1):
+                starts.append(start)
+                ends.append(end)
+                texts.append(text)
+                if count % 10 == 0:
+                    done = min(end / duration, 1.0)
+                    report(0.3 + 0.6 * (i + done) / len(video_paths), f"{file_name}: segment {count}")
+            results.append(Segments(np.array(starts), np.array(ends), texts))
+
+            del audio, segments
+            if i + EXTRACT_WORKERS < len(video_paths):
+                pending.append(extractor.submit(extract_audio, video_paths[i + EXTRACT_WORKERS]))
+
+    return results